@@ -65,6 +65,12 @@ def main():
                           cache_structlog_loggers=False)
     structlog.get_logger().info("Logging with custom stream", text="foo", i=1)
 
+    uberlogging.configure(batching=True, cache_structlog_loggers=False)
+    logger.info("Batched stream writes", text="foo", i=1)
+
+    uberlogging.configure(async_io=True, cache_structlog_loggers=False)
+    logger.info("Stream writes from a background thread", text="foo", i=1)
+
     # Contextvars demo
     ctxvar: ContextVar[str] = ContextVar("request_id")
     uberlogging.configure(contextvars=(ctxvar,), cache_structlog_loggers=False)
@@ -24,6 +24,9 @@ setup(
         "humanfriendly",
         "python-json-logger",
     ),
+    extras_require={
+        "orjson": ("orjson",),
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
@@ -1,27 +1,42 @@
 # -*- coding: utf-8 -*-
 
+import atexit
+import functools
+import json
 import logging
+import logging.handlers
 import os
+import re
 import string
 import sys
-from contextvars import ContextVar
-from copy import deepcopy
+import threading
+import weakref
+from contextvars import Context, ContextVar
 from dataclasses import dataclass
 from enum import Enum
 from logging.config import dictConfig
-from typing import Any, ClassVar, List, Tuple
+from queue import SimpleQueue
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, List, Tuple
 
 import coloredlogs
 import structlog
-from humanfriendly.terminal import ansi_wrap
+from humanfriendly.terminal import ANSI_RESET, ansi_style
 from pythonjsonlogger import jsonlogger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 __all__ = (
     "get_logger",
     "configure",
     "default_fmt",
+    "default_json_fmt",
     "default_datefmt",
-    "style",
+    "Style",
+    "BufferingStreamHandler",
 )
 
 # NOTE: Only "{" style is supported
@@ -29,11 +44,34 @@ __all__ = (
 default_fmt = ("{asctime}.{msecs:03.0f} "
                + "{name:<15} {levelname:<7} ## "
                + "{message}{context}{contextvars}    {module}.{funcName}:{lineno}")
+# JSON records carry structlog "context" as an extra field anyway (when present),
+# so there is no point in spelling it out in the format.
+default_json_fmt = ("{asctime}.{msecs:03.0f} "
+                    + "{name:<15} {levelname:<7} ## "
+                    + "{message}{contextvars}    {module}.{funcName}:{lineno}")
 default_datefmt = "%Y-%m-%dT%H:%M:%S"
 
 padding = "    "
 
 
+_conversions = {"r": repr, "s": str, "a": ascii}
+
+
+def _compile_fmt(fmt):
+    # Pre-parse "{" style format string into (literal, field, conversion, spec) tuples
+    # so that records are rendered without re-parsing the template every time.
+    # Returns None for formats we don't handle (attribute/index access, nested specs),
+    # in which case stdlib formatting is used as is.
+    compiled = []
+    for literal, field, spec, conversion in string.Formatter().parse(fmt):
+        if field is not None and not field.isidentifier():
+            return None
+        if spec and "{" in spec:
+            return None
+        compiled.append((literal, field, _conversions.get(conversion), spec or ""))
+    return tuple(compiled)
+
+
 def get_logger(*args, **kwargs) -> None:
     raise AttributeError("uberlogging.get_logger() was deprecated and removed. "
                          + "It did nothing but hoisting structlog.get_logger. "
@@ -49,11 +87,14 @@ class Style(Enum):
 
 
 def _style_to_formatter(style):
-    return {
-        Style.json: SeverityJsonFormatter,
-        Style.text_color: ColoredFormatter,
-        Style.text_no_color: Formatter,
-    }.get(style)
+    return _style_formatters.get(style)
+
+
+# Formatters are immutable once created, hence reusing them across configure() calls
+@functools.lru_cache(maxsize=32)
+def _make_formatter(style, fmt, datefmt, contextvars):
+    formatter_class = _style_to_formatter(style)
+    return formatter_class(fmt=fmt, datefmt=datefmt, contextvars=contextvars)
 
 
 def configure(style=Style.auto,
@@ -63,11 +104,21 @@ def configure(style=Style.auto,
               cache_structlog_loggers=True,
               root_level=logging.INFO,
               stream=sys.stderr,
-              contextvars: Tuple[ContextVar] = ()):
+              contextvars: Tuple[ContextVar] = (),
+              async_io: bool = False,
+              batching: bool = False,
+              enable_stack_info: bool = False,
+              enable_unicode_decode: bool = False,
+              filter_structlog_early: bool = False):
     """
     Configure both structlog and stdlib logger libraries
     with sane defaults.
 
+    Calling it again with the same handler related arguments (logger confs, stream,
+    async_io and batching) reuses existing handlers instead of rebuilding them,
+    unless logging was reconfigured by someone else in the meantime. Structlog,
+    formatting and levels are (re)applied on every call regardless.
+
     :param style:
         Force custom style as in `uberlogging.Style`. Style is
         autodetected by default.
@@ -106,6 +157,8 @@ def configure(style=Style.auto,
     :param cache_structlog_loggers:
         Enable/disabled caching of structlog loggers as described
         in `documentation <http://www.structlog.org/en/stable/performance.html>`_.
+        Cached loggers assemble their processor chain only once instead of on
+        every logging call, which is a considerable speedup.
         You should generally leave it to True, unless, e.g. writing tests.
 
     :param root_level:
@@ -121,33 +174,110 @@ def configure(style=Style.auto,
 
         **NOTE**: Python 3.7.1+ only. ContextVar.name didn't appear till then.
 
+    :param async_io:
+        Write log messages to the stream from a background thread through
+        logging.handlers.QueueHandler/QueueListener pair. Messages are still formatted
+        in the calling thread, so only the I/O is offloaded. Off by default since
+        messages reach the stream with a delay (e.g. interleaving differently with
+        other writes to it), and processes forked afterwards lose their logs as the
+        writer thread does not survive fork.
+
+    :param batching:
+        Accumulate log messages and write them to the stream in batches through
+        `uberlogging.BufferingStreamHandler`, trading a short delay (up to 50ms)
+        for far fewer stream writes on high-volume logging. Only affects
+        synchronous I/O, since ``async_io`` already batches messages written
+        in bursts.
+
+    :param enable_stack_info:
+        Add structlog's StackInfoRenderer processor to support ``stack_info=True``
+        in structlog logging calls. Off by default to keep the processor chain short.
+
+    :param enable_unicode_decode:
+        Add structlog's UnicodeDecoder processor that decodes ``bytes`` values
+        before rendering. Off by default to keep the processor chain short.
+
+    :param filter_structlog_early:
+        Use structlog's filtering bound logger that drops logging calls below the
+        lowest configured level (of root_level and logger confs) right away,
+        without even building the event dict. Note that structlog loggers won't
+        honor levels lowered through stdlib logging directly after configure().
+        Also only generic structlog BoundLogger methods are available, i.e. not the
+        stdlib specific ones.
+
     """
 
-    actual_style = _detect_style(style, stream)
+    isatty = _isatty(stream)
+    actual_style = _detect_style(style, isatty)
     colored = (actual_style == Style.text_color)
 
+    if actual_style == Style.json and fmt is default_fmt:
+        fmt = default_json_fmt
     fmt = os.environ.get("UBERLOGGING_MESSAGE_FORMAT") or fmt
-    conf = _build_conf(fmt, datefmt, logger_confs, logger_confs_list, actual_style, root_level, contextvars, stream)
-    _configure_structlog(colored, cache_structlog_loggers)
-    _configure_stdliblog(conf)
+
+    min_level = _min_level(root_level, logger_confs, logger_confs_list) if filter_structlog_early else None
+    _configure_structlog(colored, cache_structlog_loggers, enable_stack_info, enable_unicode_decode, min_level)
+
+    # NOTE: logger confs are snapshotted through repr() since they are mutable
+    handlers_key = (repr(logger_confs), repr(logger_confs_list), stream, async_io, batching)
+    logger_confs = _merge_logger_confs(logger_confs, logger_confs_list)
+    if handlers_key == _get_last_handlers_key():
+        # Handlers setup is the same - no need to tear it down and rebuild through dictConfig
+        formatter = _make_formatter(actual_style, fmt, datefmt, tuple(contextvars))
+        _update_stdliblog(formatter, root_level, logger_confs)
+    else:
+        conf, listener = _build_conf(fmt, datefmt, logger_confs, actual_style, root_level,
+                                     contextvars, stream, async_io, batching)
+        _configure_stdliblog(conf, listener)
+    _remember_handlers(handlers_key)
+
+
+_last_handlers_key = None
+_last_root_handlers = None
+
+
+def _get_last_handlers_key():
+    # Making sure nobody else replaced root handlers since, e.g. through logging.basicConfig(force=True)
+    if logging.getLogger().handlers == _last_root_handlers:
+        return _last_handlers_key
+    return None
+
+
+def _remember_handlers(handlers_key):
+    global _last_handlers_key, _last_root_handlers
+    _last_handlers_key = handlers_key
+    _last_root_handlers = list(logging.getLogger().handlers)
+
+
+def _merge_logger_confs(logger_confs, logger_confs_list):
+    merged = dict(logger_confs or {})
+    for lconf in (logger_confs_list or []):
+        lconf = dict(lconf)
+        name = lconf.pop("name")
+        merged[name] = lconf
+    return merged
+
+
+def _false():
+    return False
 
 
-def _detect_style(style, stream):
-    if os.environ.get("UBERLOGGING_FORCE_TEXT_COLOR"):
+def _isatty(stream):
+    return getattr(stream, "isatty", _false)()
+
+
+def _detect_style(style, isatty):
+    env = os.environ
+    if env.get("UBERLOGGING_FORCE_TEXT_COLOR"):
         style = Style.text_color
-    elif os.environ.get("UBERLOGGING_FORCE_TEXT_NO_COLOR"):
+    elif env.get("UBERLOGGING_FORCE_TEXT_NO_COLOR"):
         style = Style.text_no_color
-    elif os.environ.get("UBERLOGGING_FORCE_TEXT"):
+    elif env.get("UBERLOGGING_FORCE_TEXT"):
         style = Style.text_auto
 
     if style not in (Style.auto, Style.text_auto):
         return style
 
-    try:
-        isatty = stream.isatty()
-    except AttributeError:
-        isatty = False
-
     force_text = (style == Style.text_auto)
     use_json = not (isatty or force_text)
     colored = isatty and not use_json
@@ -160,63 +290,273 @@ def _detect_style(style, stream):
         return Style.text_no_color
 
 
-def _configure_structlog(colored, cache_loggers):
+def _min_level(root_level, logger_confs, logger_confs_list):
+    levels = [root_level]
+    levels.extend(lconf["level"] for lconf in (logger_confs or {}).values() if "level" in lconf)
+    levels.extend(lconf["level"] for lconf in (logger_confs_list or []) if "level" in lconf)
+    return min(level if isinstance(level, int) else logging.getLevelName(level) for level in levels)
+
+
+def _configure_structlog(colored, cache_loggers, stack_info, unicode_decode, min_level):
     processors = [
         structlog.stdlib.filter_by_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.UnicodeDecoder(),
+    ]
+    if stack_info:
+        processors.append(structlog.processors.StackInfoRenderer())
+    if unicode_decode:
+        processors.append(structlog.processors.UnicodeDecoder())
+    processors.append(
         # NOTE: We deliberatly flatten key/val structlog parameters
         # into a flat string - it's easier to read in log message
         # (both local and aggregated, e.g. Graylog) since fields
         # are highly dynamic and I prefer to track important stuff through
         # metrics
         KeyValueRendererWithFlatEventColors(renderer=ContextRenderer(colored)),
-    ]
+    )
 
     structlog.configure(
         processors=processors,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=(structlog.stdlib.BoundLogger if min_level is None
+                       else structlog.make_filtering_bound_logger(min_level)),
         cache_logger_on_first_use=cache_loggers,
     )
 
 
-def _configure_stdliblog(conf):
+def _configure_stdliblog(conf, listener):
+    global _queue_listener
+    # Stopping the old listener drains its queue, so no messages are lost on reconfiguration
+    _stop_queue_listener()
     dictConfig(conf)
-
-
-def _build_conf(fmt, datefmt, logger_confs, logger_confs_list, style: Style, root_level, contextvars, stream):
-    formatter_class = _style_to_formatter(style)
-    formatter = formatter_class(fmt=fmt, datefmt=datefmt, contextvars=contextvars)
+    if listener:
+        listener.start()
+        _queue_listener = listener
+
+
+_queue_listener = None
+
+
+def _update_stdliblog(formatter, root_level, logger_confs):
+    root = logging.getLogger()
+    root.setLevel(root_level)
+    for handler in root.handlers:
+        handler.setFormatter(formatter)
+    for name, lconf in logger_confs.items():
+        if "level" in lconf:
+            logging.getLogger(name).setLevel(lconf["level"])
+
+
+@atexit.register
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+_level_names = {
+    logging.DEBUG: "DEBUG",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "CRITICAL",
+}
+
+
+_conf_template = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "level": "DEBUG",
+            "class": "logging.StreamHandler",
+            "formatter": "current",
+        }
+    },
+    "root": {
+        "handlers": ["console"],
+    },
+}
+
+
+def _build_conf(fmt, datefmt, logger_confs, style: Style, root_level, contextvars, stream, async_io, batching):
+    formatter = _make_formatter(style, fmt, datefmt, tuple(contextvars))
+    # Only copying the parts of the template that are changed
     conf = {
-        "version": 1,
-        "disable_existing_loggers": False,
+        **_conf_template,
         "formatters": {
             "current": {
                 "()": lambda: formatter,
             },
         },
         "handlers": {
-            "console": {
-                "level": "DEBUG",
-                "class": "logging.StreamHandler",
-                "formatter": "current",
-                "stream": stream
-            }
-        },
-        "root": {
-            "level": logging.getLevelName(root_level),
-            "handlers": ["console"],
+            "console": {**_conf_template["handlers"]["console"], "stream": stream},
         },
+        "root": {**_conf_template["root"], "level": _level_names.get(root_level) or logging.getLevelName(root_level)},
     }
-    logger_confs = logger_confs or {}
-    for lconf in (logger_confs_list or []):
-        name = lconf.pop("name")
-        logger_confs[name] = lconf
     if logger_confs:
         conf["loggers"] = logger_confs
-    return conf
+
+    listener = None
+    if async_io:
+        # QueueHandler formats messages (in the calling thread) before enqueueing them,
+        # hence the actual stream handler needs no formatter of its own
+        queue = SimpleQueue()
+        listener = FlushingQueueListener(queue, BufferingStreamHandler(stream, flush_interval_ms=None),
+                                         respect_handler_level=True)
+        conf["handlers"]["console"] = {
+            "()": lambda: logging.handlers.QueueHandler(queue),
+            "level": "DEBUG",
+            "formatter": "current",
+        }
+    elif batching:
+        conf["handlers"]["console"]["class"] = "uberlogging.BufferingStreamHandler"
+    return conf, listener
+
+
+class BufferingStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that accumulates formatted messages and writes them out
+    in a single stream write once `flush_lines` messages or `buffer_size`
+    characters are collected, `flush_interval_ms` passed since the first
+    buffered message, or when explicitly flushed.
+
+    Set `flush_interval_ms` to None when the handler is flushed by other means,
+    e.g. by `FlushingQueueListener` that flushes it whenever there are no more
+    pending messages.
+
+    Forked child processes start with an empty buffer - messages pending at the
+    time of fork are written by the parent only.
+    """
+
+    def __init__(self, stream=None, flush_lines=256, flush_interval_ms=50, buffer_size=65536):
+        super().__init__(stream)
+        self.flush_lines = flush_lines
+        self.flush_interval_ms = flush_interval_ms
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_record = None  # For error reporting
+        self._timer = None
+        _buffering_handlers.add(self)
+
+    # Same as StreamHandler.emit(), nothing is raised into the logging call
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            self._buffer.append(msg)
+            self._buffered += len(msg)
+            self._last_record = record
+            if len(self._buffer) >= self.flush_lines or self._buffered >= self.buffer_size:
+                self.flush()
+            elif self._timer is None and self.flush_interval_ms is not None:
+                self._timer = threading.Timer(self.flush_interval_ms / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        except RecursionError:  # See issue 36272
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._buffer:
+                # Nothing of ours is lost - behaving as a plain StreamHandler,
+                # e.g. logging.shutdown() ignores flush errors of closed streams
+                super().flush()
+                return
+            try:
+                self.stream.write("".join(self._buffer))
+                super().flush()
+            except RecursionError:  # See issue 36272, same as StreamHandler.emit()
+                raise
+            except Exception:
+                # Never raising from here - it would kill the listener/timer thread
+                # or leak into the logging call. Buffered messages are dropped.
+                self.handleError(self._last_record)
+            finally:
+                self._buffer.clear()
+                self._buffered = 0
+                self._last_record = None
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+_buffering_handlers = weakref.WeakSet()
+
+
+# Child inherits parent's pending messages (and the timer whose thread didn't survive fork)
+def _reset_buffering_handlers_after_fork():
+    for handler in _buffering_handlers:
+        handler._buffer.clear()
+        handler._buffered = 0
+        handler._last_record = None
+        handler._timer = None
+
+
+if hasattr(os, "register_at_fork"):  # Not on Windows
+    os.register_at_fork(after_in_child=_reset_buffering_handlers_after_fork)
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its handlers once the queue is drained,
+    thus batching bursts of messages into few stream writes.
+    """
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            self.flush()
+
+    def stop(self):
+        super().stop()
+        self.flush()
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+
+def _orjson_dumps(obj, default=None, cls=None, indent=None, ensure_ascii=True, **kwargs):
+    # json.dumps compatible signature as called by pythonjsonlogger.
+    # orjson always emits compact UTF-8, hence indent is ignored and non-ASCII
+    # characters are escaped afterwards when ensure_ascii is requested.
+    orjson_default = default
+    if orjson_default is None and cls is not None:
+        orjson_default = cls().default
+    try:
+        dumped = orjson.dumps(obj, default=orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # orjson is stricter than stdlib json, e.g. rejects integers over 64 bits.
+        # Keeping orjson's compact layout for consistency.
+        return json.dumps(obj, default=default, cls=cls, ensure_ascii=ensure_ascii,
+                          separators=(",", ":"), **kwargs)
+    if ensure_ascii and not dumped.isascii():
+        # Non-ASCII characters can only appear inside JSON strings, hence safe to escape anywhere
+        dumped = _non_ascii.sub(_escape_non_ascii, dumped)
+    return dumped
+
+
+_non_ascii = re.compile(r"[^\x00-\x7f]")
+
+
+# Same as json.dumps(ensure_ascii=True) does, i.e. using surrogate pairs beyond BMP
+def _escape_non_ascii(match):
+    cp = ord(match.group())
+    if cp < 0x10000:
+        return "\\u%04x" % cp
+    cp -= 0x10000
+    return "\\u%04x\\u%04x" % (0xd800 | (cp >> 10), 0xdc00 | (cp & 0x3ff))
 
 
 class SeverityJsonFormatter(jsonlogger.JsonFormatter):
@@ -224,13 +564,22 @@ class SeverityJsonFormatter(jsonlogger.JsonFormatter):
     def __init__(self, *args, contextvars: Tuple[ContextVar] = (), **kwargs):
         # Requesting new Python3 style formatting
         kwargs["style"] = "{"
+        if orjson is not None:
+            kwargs.setdefault("json_serializer", _orjson_dumps)
         self.contextvars = contextvars
+        self._has_contextvars = bool(contextvars)
+        self._contextvar_getters = _contextvar_getters(contextvars)
         self.renderer = kwargs.pop("renderer", ContextRenderer(color=False))
+        self._parsed_fields = None
         super().__init__(*args, **kwargs)
+        self._uses_contextvars = "contextvars" in self.parse()
 
+    # self._fmt does not change after construction, hence parsing it only once
     def parse(self):
-        field_spec = string.Formatter().parse(self._fmt)
-        return [s[1] for s in field_spec]
+        if self._parsed_fields is None:
+            field_spec = string.Formatter().parse(self._fmt)
+            self._parsed_fields = [s[1] for s in field_spec if s[1]]
+        return self._parsed_fields
 
     def add_fields(self, log_record, record, message_dict):
         # Fix for Stackdriver that expects loglevel in "severity" field
@@ -238,8 +587,10 @@ class SeverityJsonFormatter(jsonlogger.JsonFormatter):
         log_record["severity"] = record.levelname
 
     def format(self, record):
-        if self.contextvars:
-            record.contextvars = self.renderer.render_contextvars(self.contextvars)
+        if self._has_contextvars:
+            record.contextvars = self.renderer.render_contextvars(self._contextvar_getters)
+        elif self._uses_contextvars:
+            record.__dict__.setdefault("contextvars", "")
         return super().format(record)
 
 
@@ -248,42 +599,93 @@ class Formatter(logging.Formatter):
     def __init__(self, fmt=None, datefmt=None, style="{", contextvars: Tuple[ContextVar] = (), **kwargs):
         style = "{"
         self.contextvars = contextvars
+        self._has_contextvars = bool(contextvars)
+        self._contextvar_getters = _contextvar_getters(contextvars)
         self.renderer = kwargs.pop("renderer", ContextRenderer(color=False))
         super().__init__(fmt=fmt, datefmt=datefmt, style=style, **kwargs)
+        # NOTE: Compiling only after super().__init__ since subclasses may rewrite
+        # the format string, e.g. coloredlogs injects ANSI escape sequences into it
+        self._uses_time = super().usesTime()
+        self._compiled_fmt = None if getattr(self._style, "_defaults", None) else _compile_fmt(self._fmt)
 
     # Since we want to provide uniformity between stdlib and structlog
     # We need to make sure that "context" attribute is always present
     # in the log record - this is to enable using unified formatting style.
     # If structlog is used it will inject the "context" as part of the
     # "extra" dictionary. However if stdlib is used, we need to fullfil it
-    # "manually" here. Same for "contextvars" attribute.
+    # "manually" here. Same goes for "contextvars" attribute.
     def format(self, record):
-        if not hasattr(record, "context"):
-            record.context = ""
-        if self.contextvars:
-            record.contextvars = ((" " if record.context else padding)
-                                  + self.renderer.render_contextvars(self.contextvars))
+        values = record.__dict__
+        context = values.setdefault("context", "")
+        if self._has_contextvars:
+            record.contextvars = ((" " if context else padding)
+                                  + self.renderer.render_contextvars(self._contextvar_getters))
         else:
-            record.contextvars = ""
+            values.setdefault("contextvars", "")
         return super().format(record)
 
+    def usesTime(self):
+        return self._uses_time
+
+    def formatMessage(self, record):
+        if self._compiled_fmt is None:
+            return super().formatMessage(record)
+        values = record.__dict__
+        parts = []
+        for literal, field, conversion, spec in self._compiled_fmt:
+            parts.append(literal)
+            if field is not None:
+                try:
+                    val = values[field]
+                except KeyError as e:  # Same as stdlib does
+                    raise ValueError("Formatting field not found in record: %s" % e)
+                if conversion is not None:
+                    val = conversion(val)
+                parts.append(format(val, spec))
+        return "".join(parts)
+
+
+# Copying the (flat) inner style dicts to stay isolated from coloredlogs defaults being changed
+_field_styles = MappingProxyType({
+    **{field: dict(style) for field, style in coloredlogs.DEFAULT_FIELD_STYLES.items()},
+    "module": {"color": "white", "faint": True},
+    "funcName": {"color": "white", "faint": True},
+    "lineno": {"color": "white", "faint": True},
+})
+
 
 class ColoredFormatter(Formatter, coloredlogs.ColoredFormatter):
-    custom_field_styles = deepcopy(coloredlogs.DEFAULT_FIELD_STYLES)
-    custom_field_styles.update({
-        "module": {"color": "white", "faint": True},
-        "funcName": {"color": "white", "faint": True},
-        "lineno": {"color": "white", "faint": True},
-    })
 
     # Exposing logging.Formatter interface since we don't initialize this class by ourselves
     def __init__(self, fmt=None, datefmt=None, style="{", contextvars: Tuple[ContextVar] = (), **kwargs):
         renderer = kwargs.pop("renderer", ContextRenderer(color=True))
         super().__init__(fmt=fmt, datefmt=datefmt, style=style,
-                         field_styles=self.custom_field_styles,
+                         field_styles=_field_styles,
                          contextvars=contextvars, renderer=renderer, **kwargs)
 
 
+_missing = object()
+
+
+# Contextvars set is fixed per formatter - resolving names, bound getters and defaults once.
+# The default is what the contextvar falls back to when not set (var's own default if it
+# has one, _missing otherwise) so rendering can use get(default) instead of catching LookupError.
+def _contextvar_getters(contextvars: Tuple[ContextVar]) -> Tuple[Tuple[str, Callable[[Any], Any], Any]]:
+    return tuple((var.name, var.get, _contextvar_default(var)) for var in contextvars)
+
+
+def _contextvar_default(var: ContextVar) -> Any:
+    try:
+        return Context().run(var.get)  # Nothing is set in an empty context
+    except LookupError:
+        return _missing
+
+
+def _ansi_codes(style: dict) -> Tuple[str, str]:
+    start = ansi_style(**style)
+    return (start, ANSI_RESET) if start else ("", "")
+
+
 @dataclass
 class ContextRenderer:
     style_key: ClassVar[dict] = {"color": "cyan"}
@@ -291,38 +693,73 @@ class ContextRenderer:
 
     color: bool
 
-    def format_item(self, key: str, val: Any) -> str:
-        return "{}={}".format(
-            (ansi_wrap(key, **self.style_key) if self.color else key),
-            (ansi_wrap(repr(val), **self.style_val) if self.color else repr(val))
-        )
+    # ANSI sequences are precomputed rather than produced by ansi_wrap() for every item
+    def __post_init__(self):
+        self._key_pre, self._key_post = _ansi_codes(self.style_key) if self.color else ("", "")
+        self._val_pre, self._val_post = _ansi_codes(self.style_val) if self.color else ("", "")
 
-    def render_contextvars(self, vars: Tuple[ContextVar]) -> str:
+    def format_item(self, key: str, val: Any) -> str:
+        if not self.color:
+            return f"{key}={val!r}"
+        return f"{self._key_pre}{key}{self._key_post}={self._val_pre}{val!r}{self._val_post}"
+
+    def render_contextvars(self, getters: Tuple[Tuple[str, Callable[[Any], Any], Any]]) -> str:
+        """Render contextvars given as (name, getter, default) tuples, see `_contextvar_getters`"""
+        if not getters:
+            return ""
+        format_item = self.format_item
         ctx_items: List[str] = []
-        for var in vars:
-            try:
-                ctx_items.append(self.format_item(var.name, var.get()))
-            except LookupError:  # contextvar is not set - ignoring
+        for name, get, default in getters:
+            val = get(default)
+            if val is _missing:  # contextvar is not set - ignoring
                 continue
+            ctx_items.append(format_item(name, val))
         return " ".join(ctx_items)
 
 
+# Shared by all log records without structlog context
+_empty_extra = MappingProxyType({"context": ""})
+
+
 @dataclass
 class KeyValueRendererWithFlatEventColors:
     renderer: ContextRenderer
 
+    # Picking rendering specialization once rather than checking for colors on every record
+    def __post_init__(self):
+        renderer = self.renderer
+        if renderer.color:
+            self._render_context = functools.partial(_render_colored_context, renderer._key_pre, renderer._key_post,
+                                                     renderer._val_pre, renderer._val_post)
+        else:
+            self._render_context = _render_context
+
     def __call__(self, _, __, event_dict):
-        ev = event_dict.pop("event") if "event" in event_dict else ""
-        if not isinstance(ev, str):
+        ev = event_dict.pop("event", "")
+        if type(ev) is not str:
             ev = str(ev)
+        exc_info = event_dict.pop("exc_info", None)
+        if not event_dict:
+            return {"msg": ev, "exc_info": exc_info, "extra": _empty_extra}
+        return {"msg": ev, "exc_info": exc_info, "extra": {"context": self._render_context(event_dict)}}
+
+
+# Inlined no-color ContextRenderer.format_item() - saves a method call per item
+def _render_context(items: dict) -> str:
+    return padding + " ".join([f"{key}={val!r}" for key, val in items.items()])
 
-        context = " ".join(
-            self.renderer.format_item(key, val)
 
-            for key, val in event_dict.items() if key != "exc_info"
-        )
+# Inlined color ContextRenderer.format_item() - saves a method call per item
+def _render_colored_context(key_pre: str, key_post: str, val_pre: str, val_post: str, items: dict) -> str:
+    return padding + " ".join([
+        f"{key_pre}{key}{key_post}={val_pre}{val!r}{val_post}"
+        for key, val in items.items()
+    ])
 
-        if context:
-            context = padding + context
 
-        return {"msg": ev, "exc_info": event_dict.get("exc_info"), "extra": {"context": context}}
+# NOTE: Defined at the bottom since it refers to formatter classes above
+_style_formatters = {
+    Style.json: SeverityJsonFormatter,
+    Style.text_color: ColoredFormatter,
+    Style.text_no_color: Formatter,
+}